@@ -0,0 +1,101 @@
+"""
+Этот файл содержит middleware для сжатия ответов API с согласованием кодировки (brotli/gzip).
+"""
+import gzip
+
+from starlette.datastructures import MutableHeaders
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import Response
+
+try:
+    import brotli
+except ImportError:  # brotli - необязательная зависимость, без нее используется только gzip
+    brotli = None
+
+# Минимальный размер тела ответа в байтах, начиная с которого ответ сжимается
+MINIMUM_SIZE = 500
+
+
+def parse_accept_encoding(accept_encoding: str) -> dict:
+    """
+    Разбор заголовка Accept-Encoding.
+
+    Возвращает словарь {кодировка: q-значение}. Параметр q ищется среди всех параметров кодировки;
+    некорректные значения и значения вне диапазона [0, 1] считаются отказом (q=0).
+    """
+
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, *params = [part.strip() for part in item.split(";")]
+        if not name:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = [part.strip() for part in param.partition("=")]
+            if key.lower() != "q":
+                continue
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+            if not 0.0 <= quality <= 1.0:
+                quality = 0.0
+        accepted[name.lower()] = quality
+    return accepted
+
+
+def choose_encoding(accept_encoding: str):
+    """
+    Выбор кодировки сжатия по заголовку Accept-Encoding.
+
+    Учитывает q-значения; brotli предпочтительнее gzip, если библиотека brotli установлена.
+    Возвращает 'br', 'gzip' или None, если клиент не принимает сжатые ответы.
+    """
+
+    accepted = parse_accept_encoding(accept_encoding)
+    supported = ["br", "gzip"] if brotli is not None else ["gzip"]
+    quality = {enc: accepted.get(enc, accepted.get("*", 0.0)) for enc in supported}
+    candidates = [enc for enc in supported if quality[enc] > 0]
+    if not candidates:
+        return None
+    return max(candidates, key=quality.get)
+
+
+class CompressionMiddleware(BaseHTTPMiddleware):
+    """
+    Middleware для сжатия ответов.
+
+    Сжимает тело ответа в gzip или brotli в зависимости от заголовка Accept-Encoding клиента.
+    Ответы меньше minimum_size байт и уже сжатые ответы отдаются без изменений.
+    """
+
+    def __init__(self, app, minimum_size: int = MINIMUM_SIZE, gzip_level: int = 6, brotli_quality: int = 4):
+        super().__init__(app)
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        if "content-encoding" in response.headers:
+            return response
+
+        # Представление ответа зависит от Accept-Encoding, даже если сжатие не применяется
+        response.headers.add_vary_header("Accept-Encoding")
+        encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+        if encoding is None:
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        headers = MutableHeaders(raw=[(key, value) for key, value in response.raw_headers
+                                      if key.lower() != b"content-length"])
+        if len(body) >= self.minimum_size:
+            if encoding == "br":
+                body = brotli.compress(body, quality=self.brotli_quality)
+            else:
+                body = gzip.compress(body, compresslevel=self.gzip_level)
+            headers["Content-Encoding"] = encoding
+        headers["Content-Length"] = str(len(body))
+
+        return Response(content=body, status_code=response.status_code, headers=headers,
+                        background=response.background)
@@ -1,19 +1,55 @@
 from fastapi import FastAPI, Depends, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
+from compression import CompressionMiddleware
 from database import engine
 from model import Base, User, Task, TaskPermission
-from schemas import UserCreate, UserRead, TaskRead, TaskCreate, TaskUpdate, TaskPermissionCreate, Token, \
-    TaskPermissionUpdate
+from schemas import UserCreate, UserRead, TaskRead, TaskReadPartial, TaskCreate, TaskUpdate, TaskPermissionCreate, \
+    Token, TaskPermissionUpdate
 from security import get_password_hash, verify_password, create_access_token, get_current_user, get_db
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 import uvicorn
-from typing import List
+from typing import List, Optional, Union
 
 app = FastAPI()
+app.add_middleware(CompressionMiddleware)
 Base.metadata.create_all(bind=engine)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+TASK_FIELDS = tuple(Task.__table__.columns.keys())
+
+
+def get_task_fields(fields: Optional[str] = None) -> Optional[List[str]]:
+    """
+    Разбор параметра fields для выборочного возврата полей задачи.
+
+    Принимает список полей через запятую (например, fields=id,title,status).
+    Если параметр не передан, возвращает None и задача отдается целиком (TaskRead).
+    Неизвестные поля приводят к ошибке 400.
+    """
+
+    if fields is None:
+        return None
+    names = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in names if name not in TASK_FIELDS]
+    if not names or unknown:
+        raise HTTPException(status_code=400, detail=f"Invalid fields: {', '.join(unknown) or fields}")
+    return names
+
+
+def task_fields_response(task, fields: List[str]) -> JSONResponse:
+    """
+    Сериализация только выбранных полей задачи (или списка задач).
+    """
+
+    if isinstance(task, list):
+        content = [{name: getattr(item, name) for name in fields} for item in task]
+    else:
+        content = {name: getattr(task, name) for name in fields}
+    return JSONResponse(content=jsonable_encoder(content))
+
 
 @app.post("/register", response_model=UserRead)
 def register_user(user: UserCreate, db: Session = Depends(get_db)):
@@ -50,48 +86,58 @@ def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db:
     return {"access_token": access_token, "token_type": "bearer"}
 
 
-@app.post("/tasks/", response_model=TaskRead)
-def create_task(task: TaskCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+@app.post("/tasks/", response_model=Union[TaskRead, TaskReadPartial])
+def create_task(task: TaskCreate, fields: Optional[List[str]] = Depends(get_task_fields),
+                db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     """
     Создание новой задачи.
 
     Создает задачу и связывает ее с текущим пользователем.
+    Если передан параметр fields, возвращаются только указанные поля задачи (TaskReadPartial).
     """
 
     db_task = Task(title=task.title, creator_id=current_user.id)
     db.add(db_task)
     db.commit()
     db.refresh(db_task)
+    if fields:
+        return task_fields_response(db_task, fields)
     return db_task
 
 
-@app.get("/tasks/", response_model=List[TaskRead])
-def read_tasks(skip: int = 0, limit: int = 10, db: Session = Depends(get_db),
-               current_user: User = Depends(get_current_user)):
+@app.get("/tasks/", response_model=List[Union[TaskRead, TaskReadPartial]])
+def read_tasks(skip: int = 0, limit: int = 10, fields: Optional[List[str]] = Depends(get_task_fields),
+               db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     """
     Чтение списка задач.
 
     Возвращает задачи, созданные текущим пользователем, и задачи, к которым у пользователя есть права на чтение.
+    Если передан параметр fields, из базы данных выбираются и возвращаются только указанные поля (TaskReadPartial).
     """
 
+    # Выбираемые колонки: id нужен всегда, чтобы объединение не схлопывало разные задачи с одинаковыми полями
+    columns = [Task] if not fields else [getattr(Task, name) for name in dict.fromkeys(["id", *fields])]
     # Список задач, созданных текущим пользователем
-    created_tasks = db.query(Task).filter(Task.creator_id == current_user.id)
+    created_tasks = db.query(*columns).filter(Task.creator_id == current_user.id)
     # Список задач, к которым текущий пользователь имеет права на чтение
-    perm_tasks = db.query(Task).join(TaskPermission).filter(TaskPermission.user_id == current_user.id,
-                                                            TaskPermission.can_read == True)
+    perm_tasks = db.query(*columns).select_from(Task).join(TaskPermission).filter(
+        TaskPermission.user_id == current_user.id, TaskPermission.can_read == True)
     # Объединение результатов
     tasks = created_tasks.union(perm_tasks).offset(skip).limit(limit).all()
 
+    if fields:
+        return task_fields_response(tasks, fields)
     return tasks
 
 
-@app.patch("/tasks/{task_id}", response_model=TaskRead)
-def update_task(task_id: int, task: TaskUpdate, db: Session = Depends(get_db),
-                current_user: User = Depends(get_current_user)):
+@app.patch("/tasks/{task_id}", response_model=Union[TaskRead, TaskReadPartial])
+def update_task(task_id: int, task: TaskUpdate, fields: Optional[List[str]] = Depends(get_task_fields),
+                db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     """
     Обновление задачи.
 
     Проверяет права текущего пользователя на обновление задачи и обновляет задачу в базе данных.
+    Если передан параметр fields, возвращаются только указанные поля задачи (TaskReadPartial).
     """
 
     # Проверка прав текущего пользователя
@@ -108,6 +154,8 @@ def update_task(task_id: int, task: TaskUpdate, db: Session = Depends(get_db),
     db_task.status = task.status
     db.commit()
     db.refresh(db_task)
+    if fields:
+        return task_fields_response(db_task, fields)
     return db_task
 
 
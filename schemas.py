@@ -92,6 +92,27 @@ class TaskRead(TaskBase):
     """
 
 
+class TaskReadPartial(BaseModel):
+    id: Optional[int] = None
+    title: Optional[str] = None
+    status: Optional[str] = None
+    creator_id: Optional[int] = None
+    creation_date: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+    """
+    Модель для чтения задачи с выборочным набором полей (параметр fields).
+
+    Атрибуты совпадают с TaskRead, но все они необязательны: в ответе присутствуют
+    только поля, перечисленные в параметре fields.
+
+    Конфигурация:
+    - from_attributes: Настройка для работы с атрибутами модели ORM.
+    """
+
+
 class TaskPermissionCreate(BaseModel):
     user_id: int
     can_read: bool = False
@@ -1,8 +1,10 @@
 from sqlalchemy.orm import Session
-from model import User, Task
+from model import User, Task, TaskPermission
 from security import get_password_hash, verify_password, create_access_token
 from fastapi.testclient import TestClient
 import pytest
+import compression
+from compression import choose_encoding
 
 
 def test_register_user_success(client: TestClient, db: Session):
@@ -88,3 +90,172 @@ def test_read_tasks_success(client: TestClient, db: Session, user_token):
     assert len(data) >= 2
     assert any(task["title"] == "Task 1" for task in data)
     assert any(task["title"] == "Task 2" for task in data)
+
+
+def test_read_tasks_fields(client: TestClient, db: Session, user_token):
+    """
+    Проверка на возврат только запрошенных полей задач
+    """
+    user = db.query(User).filter(User.login == "taskuser").first()
+    db.add(Task(title="Task 1", creator_id=user.id))
+    db.add(Task(title="Task 1", creator_id=user.id))
+    db.commit()
+
+    response = client.get("/tasks/?fields=title,status", headers=user_token)
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 2
+    assert all(task == {"title": "Task 1", "status": "Created"} for task in data)
+
+
+def test_read_tasks_invalid_fields(client: TestClient, db: Session, user_token):
+    """
+    Проверка на ошибку при запросе несуществующих полей задачи
+    """
+    response = client.get("/tasks/?fields=title,secret", headers=user_token)
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid fields: secret"}
+
+
+def test_read_tasks_compression(client: TestClient, db: Session, user_token):
+    """
+    Проверка на сжатие больших ответов и отсутствие сжатия маленьких
+    """
+    response = client.get("/tasks/", headers={**user_token, "Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+
+    user = db.query(User).filter(User.login == "taskuser").first()
+    for i in range(10):
+        db.add(Task(title=f"Task {i}", creator_id=user.id))
+    db.commit()
+
+    response = client.get("/tasks/", headers={**user_token, "Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) == response.num_bytes_downloaded
+    assert response.num_bytes_downloaded < len(response.content)
+    assert len(response.json()) == 10
+
+
+def test_read_tasks_no_compression_without_accept_encoding(client: TestClient, db: Session, user_token):
+    """
+    Проверка на отсутствие сжатия, если клиент не принимает сжатые ответы
+    """
+    user = db.query(User).filter(User.login == "taskuser").first()
+    for i in range(10):
+        db.add(Task(title=f"Task {i}", creator_id=user.id))
+    db.commit()
+
+    for accept_encoding in ("", "identity", "gzip;q=0"):
+        response = client.get("/tasks/", headers={**user_token, "Accept-Encoding": accept_encoding})
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert int(response.headers["content-length"]) == len(response.content)
+        assert len(response.json()) == 10
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("gzip", "gzip"),
+    ("gzip;q=0", None),
+    ("gzip;level=1;q=0", None),
+    ("gzip; q = 0", None),
+    ("gzip;q=1.5", None),
+    ("gzip;q=-1", None),
+    ("gzip;q=abc", None),
+    ("identity", None),
+    ("", None),
+    ("*", "br"),
+    ("*, br;q=0", "gzip"),
+    ("br, gzip", "br"),
+    ("br;q=0.5, gzip", "gzip"),
+    ("br, gzip; q = 0.5", "br"),
+])
+def test_choose_encoding(monkeypatch, accept_encoding, expected):
+    """
+    Проверка на выбор кодировки сжатия по заголовку Accept-Encoding
+    """
+    monkeypatch.setattr(compression, "brotli", object())
+    assert choose_encoding(accept_encoding) == expected
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("br", None),
+    ("br, gzip", "gzip"),
+    ("*", "gzip"),
+])
+def test_choose_encoding_without_brotli(monkeypatch, accept_encoding, expected):
+    """
+    Проверка на выбор кодировки сжатия, если библиотека brotli не установлена
+    """
+    monkeypatch.setattr(compression, "brotli", None)
+    assert choose_encoding(accept_encoding) == expected
+
+
+def test_create_task_fields(client: TestClient, db: Session, user_token):
+    """
+    Проверка на возврат только запрошенных полей созданной задачи
+    """
+    response = client.post("/tasks/?fields=id,title", json={"title": "New Task"}, headers=user_token)
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data) == {"id", "title"}
+    assert data["title"] == "New Task"
+
+
+def test_update_task_fields(client: TestClient, db: Session, user_token):
+    """
+    Проверка на возврат только запрошенных полей обновленной задачи
+    """
+    user = db.query(User).filter(User.login == "taskuser").first()
+    task = Task(title="Task 1", creator_id=user.id)
+    db.add(task)
+    db.commit()
+
+    response = client.patch(f"/tasks/{task.id}?fields=status", json={"title": "Task 1", "status": "Done"},
+                            headers=user_token)
+    assert response.status_code == 200
+    assert response.json() == {"status": "Done"}
+
+
+def test_create_update_task_invalid_fields(client: TestClient, db: Session, user_token):
+    """
+    Проверка на ошибку при запросе несуществующих полей при создании и обновлении задачи
+    """
+    user = db.query(User).filter(User.login == "taskuser").first()
+    task = Task(title="Task 1", creator_id=user.id)
+    db.add(task)
+    db.commit()
+
+    response = client.post("/tasks/?fields=secret", json={"title": "New Task"}, headers=user_token)
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid fields: secret"}
+
+    response = client.patch(f"/tasks/{task.id}?fields=secret", json={"title": "Task 1"}, headers=user_token)
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid fields: secret"}
+
+
+def test_read_tasks_fields_shared(client: TestClient, db: Session, user_token):
+    """
+    Проверка на возврат запрошенных полей задач, к которым выданы права на чтение
+    """
+    user = db.query(User).filter(User.login == "taskuser").first()
+    owner = User(login="owner", hashed_password=get_password_hash("ownerpassword"), role="user")
+    db.add(owner)
+    db.commit()
+    own_task = Task(title="Own Task", creator_id=user.id)
+    shared_task = Task(title="Shared Task", creator_id=owner.id)
+    hidden_task = Task(title="Hidden Task", creator_id=owner.id)
+    db.add_all([own_task, shared_task, hidden_task])
+    db.commit()
+    db.add(TaskPermission(task_id=shared_task.id, owner_id=owner.id, user_id=user.id, can_read=True))
+    db.commit()
+
+    response = client.get("/tasks/?fields=id,title", headers=user_token)
+    assert response.status_code == 200
+    data = sorted(response.json(), key=lambda task: task["id"])
+    assert data == [{"id": own_task.id, "title": "Own Task"}, {"id": shared_task.id, "title": "Shared Task"}]